@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import traceback
 from pathlib import Path
@@ -5,7 +6,10 @@ from pathlib import Path
 import click
 from dotenv import load_dotenv
 
+from cluster_manager.churn.engine import ChurnEngine
+from cluster_manager.churn.schedule import ChurnSchedule
 from cluster_manager.configuration.concrete.my_config import MyTestingConfiguration
+from cluster_manager.drivers.docker.image_builder import LocalImageBuilder
 from cluster_manager.drivers.docker.local_docker_helper import LocalDockerHelper
 from cluster_manager.drivers.running_network_spec import Spec
 
@@ -15,11 +19,12 @@ def main_command():
     pass
 
 @click.command
-def start_cluster():
+@click.option('--prune', is_flag=True, help='Remove images left behind by earlier builds')
+def start_cluster(prune: bool):
     config = MyTestingConfiguration()
     helper = LocalDockerHelper()
 
-    driver_data = helper.build_network(config)
+    driver_data = helper.build_network(config, prune_images=prune)
 
     try:
         driver = helper.get_driver(driver_data)
@@ -52,6 +57,14 @@ def start_cluster():
         logging.error(f'Error occurred: {traceback.format_exc()}')
         helper.teardown_network(driver_data)
 
+@click.command
+@click.option('--prune', is_flag=True, help='Remove images left behind by earlier builds')
+def build_images(prune: bool):
+    config = MyTestingConfiguration()
+    image_tags = LocalImageBuilder(LocalDockerHelper().client).build_all(config.get_images(), prune=prune)
+    for tag in image_tags.values():
+        click.echo(tag)
+
 @click.command
 def stop_cluster():
     with open('/tmp/network_spec.json') as f:
@@ -70,10 +83,41 @@ def exec_in_node(node_name: str, command: str):
     for chunk in result.output:
         click.echo(chunk, nl=False)
 
+@click.command
+@click.argument('schedule_file', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--report', 'report_file', type=click.Path(dir_okay=False, path_type=Path), default=Path('/tmp/churn_report.json'))
+def run_churn(schedule_file: Path, report_file: Path):
+    with open('/tmp/network_spec.json') as f:
+        spec = Spec.model_validate_json(f.read())
+
+    with open(schedule_file) as f:
+        schedule = ChurnSchedule.model_validate_json(f.read())
+
+    driver = LocalDockerHelper().get_driver(spec.driver_data)
+    engine = ChurnEngine(driver, MyTestingConfiguration(), schedule)
+    report = asyncio.run(engine.run())
+
+    with open(report_file, 'w') as f:
+        f.write(report.model_dump_json(indent=2))
+
+    lag = report.dispatch_lag
+    click.echo(f'{len(report.events)} events in {report.duration_s:.1f}s, dispatch lag p50={lag.p50} p99={lag.p99}')
+    for node in report.nodes:
+        conv = node.convergence
+        click.echo(
+            f'{node.node}: reconvergence p50={conv.p50} p90={conv.p90} p99={conv.p99} max={conv.max} '
+            f'(unaffected={node.unaffected}, timed out={node.timed_out}, overlapped={node.overlapped}) '
+            f'bgp backlog max recv-q={node.max_recv_q} send-q={node.max_send_q} '
+            f'({node.backlogged_samples}/{node.total_samples} samples backlogged)'
+        )
+    click.echo(f'Full report written to {report_file}')
+
 def build_cli():
     main_command.add_command(start_cluster)
+    main_command.add_command(build_images)
     main_command.add_command(stop_cluster)
     main_command.add_command(exec_in_node)
+    main_command.add_command(run_churn)
 
 def main():
     load_dotenv()
@@ -0,0 +1,276 @@
+import asyncio
+import bisect
+import io
+import logging
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Set
+
+from docker.models.containers import ExecResult
+from pyre_extensions import none_throws
+
+from cluster_manager.churn.monitor import ConvergenceMonitor, NodeTrace
+from cluster_manager.churn.report import (
+    ChurnReport,
+    EventReport,
+    LatencySummary,
+    NodeConvergence,
+    NodeReport,
+)
+from cluster_manager.churn.schedule import ChurnEvent, ChurnSchedule, ChurnStep, LinkFlap, PrefixBurst
+from cluster_manager.churn.timer_wheel import TimerWheel
+from cluster_manager.configuration.models import Node, Service, TestingConfiguration
+from cluster_manager.drivers.base import BaseDriver
+
+
+@dataclass
+class _Occurrence:
+    event: ChurnEvent
+    index: int
+    scheduled_at_s: float
+    started_at_s: float | None = None
+    restored_at_s: float | None = None
+    failures: List[str] = field(default_factory=list)
+
+class ChurnEngine:
+    """
+    Runs a churn schedule against a running cluster and measures how long
+    every node takes to reconverge after each event.
+
+    Event occurrences are released by a timer wheel and their commands run on
+    a bounded thread pool, so a schedule faster than the cluster can absorb
+    shows up as dispatch lag in the report instead of skewing the timeline.
+    """
+    driver: BaseDriver
+    config: TestingConfiguration
+    schedule: ChurnSchedule
+    services: Dict[str, List[Service]]
+
+    _wheel: TimerWheel
+    _executor: ThreadPoolExecutor | None
+    _in_flight: Set[asyncio.Task]
+    _occurrences: List[_Occurrence]
+
+    def __init__(self, driver: BaseDriver, config: TestingConfiguration, schedule: ChurnSchedule):
+        self.driver = driver
+        self.config = config
+        self.schedule = schedule
+        self.services = {
+            node.name: [service(node) for service in config.get_services() if service.match_node(node)]
+            for node in config.topology.nodes.values()
+        }
+
+        self._wheel = TimerWheel(schedule.tick_ms / 1000)
+        self._executor = None
+        self._in_flight = set()
+        self._occurrences = []
+
+        self._validate()
+
+    def _validate(self):
+        topology = self.config.topology
+        interfaces = {
+            (intf.node.name, intf.name) for link in topology.links for intf in (link.a, link.z)
+        }
+
+        for event in self.schedule.events:
+            if event.node not in topology.nodes:
+                raise ValueError(f'{event.label()}: unknown node {event.node}')
+            if isinstance(event, LinkFlap) and (event.node, event.interface) not in interfaces:
+                raise ValueError(f'{event.label()}: node {event.node} has no interface {event.interface}')
+            if isinstance(event, PrefixBurst) and not any(
+                service.kernel_route_table == event.table for service in self.services[event.node]
+            ):
+                raise ValueError(f'{event.label()}: no service on node {event.node} learns routes from table {event.table}')
+
+    def _timed_run_step(self, node: Node, step: ChurnStep) -> t.Tuple[float, ExecResult]:
+        # Runs on the worker thread, so time spent queued for a thread is not counted as running
+        ran_at_s = self._wheel.now()
+        for path, contents in step.files.items():
+            self.driver.install_file(node, Path(path), io.BytesIO(contents))
+
+        return ran_at_s, self.driver.run_cmd(node, step.cmd, wait=step.wait)
+
+    async def _run_step_cmd(self, occurrence: _Occurrence, step: ChurnStep) -> float:
+        node = self.config.topology.nodes[occurrence.event.node]
+        loop = asyncio.get_running_loop()
+        try:
+            ran_at_s, result = await loop.run_in_executor(
+                self._executor, self._timed_run_step, node, step
+            )
+        except Exception as e:
+            occurrence.failures.append(f'{step.cmd}: {e}')
+            return self._wheel.now()
+
+        if result.exit_code is not None and result.exit_code != 0:
+            output = (result.output or b'').decode(errors='replace').strip()
+            occurrence.failures.append(f'{step.cmd}: exit code {result.exit_code} {output}')
+
+        return ran_at_s
+
+    async def _run_steps(self, occurrence: _Occurrence):
+        steps = occurrence.event.steps(self.services[occurrence.event.node])
+
+        first_ran_at_s: float | None = None
+        for step in sorted(steps, key=lambda s: s.offset_s):
+            # Offsets count from when the first command actually ran, so a queued flap keeps its length
+            if first_ran_at_s is not None:
+                delay = first_ran_at_s + step.offset_s - self._wheel.now()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            ran_at_s = await self._run_step_cmd(occurrence, step)
+            if first_ran_at_s is None:
+                first_ran_at_s = ran_at_s
+                occurrence.started_at_s = ran_at_s
+
+    async def _run_occurrence(self, occurrence: _Occurrence):
+        try:
+            await self._run_steps(occurrence)
+        except Exception as e:
+            occurrence.failures.append(f'{type(e).__name__}: {e}')
+
+        if occurrence.started_at_s is None:
+            occurrence.started_at_s = self._wheel.now()
+        occurrence.restored_at_s = self._wheel.now()
+        if occurrence.failures:
+            logging.warning(f'{occurrence.event.label()}#{occurrence.index}: {"; ".join(occurrence.failures)}')
+
+    def _fire(self, event: ChurnEvent, index: int, scheduled_at_s: float):
+        occurrence = _Occurrence(event=event, index=index, scheduled_at_s=scheduled_at_s)
+        self._occurrences.append(occurrence)
+
+        task = asyncio.create_task(self._run_occurrence(occurrence))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    def _convergence(
+        self,
+        node_name: str,
+        trace: NodeTrace,
+        ref_s: float,
+        window_end_s: float,
+        end_s: float,
+    ) -> NodeConvergence:
+        settle_s = self.schedule.settle_s
+        timeout_s = self.schedule.convergence_timeout_s
+        # A window that stops before the end of the run was cut short by the next occurrence
+        cut = window_end_s < end_s
+        unresolved = 'overlapped' if cut else 'timeout'
+
+        first = bisect.bisect_left(trace.changes, ref_s)
+        in_window = trace.changes[first:bisect.bisect_left(trace.changes, window_end_s, lo=first)]
+        if not in_window or in_window[0] - ref_s > timeout_s:
+            if ref_s + settle_s > window_end_s:
+                return NodeConvergence(node=node_name, status=unresolved)
+            return NodeConvergence(node=node_name, status='unaffected')
+
+        # Follow the chain of changes until the state holds still for a full settle window
+        last = in_window[0]
+        for change in in_window[1:]:
+            if change - last > settle_s:
+                break
+            last = change
+
+        if last - ref_s > timeout_s:
+            return NodeConvergence(node=node_name, status='timeout')
+        if last + settle_s > window_end_s:
+            return NodeConvergence(node=node_name, status=unresolved)
+
+        return NodeConvergence(node=node_name, status='converged', seconds=last - ref_s)
+
+    def _build_report(self, monitor: ConvergenceMonitor, settled: bool) -> ChurnReport:
+        end_s = self._wheel.now()
+
+        # Changes are only credited to an occurrence until the next one starts
+        occurrences = sorted(self._occurrences, key=lambda o: none_throws(o.started_at_s))
+        window_ends = [none_throws(o.started_at_s) for o in occurrences[1:]] + [end_s]
+
+        events = []
+        for occurrence, window_end_s in zip(occurrences, window_ends):
+            ref_s = occurrence.restored_at_s if occurrence.restored_at_s is not None else none_throws(occurrence.started_at_s)
+            events.append(EventReport(
+                label=occurrence.event.label(),
+                kind=occurrence.event.kind,
+                node=occurrence.event.node,
+                index=occurrence.index,
+                scheduled_at_s=occurrence.scheduled_at_s,
+                started_at_s=none_throws(occurrence.started_at_s),
+                restored_at_s=occurrence.restored_at_s,
+                failures=occurrence.failures,
+                convergence=[
+                    self._convergence(node_name, trace, ref_s, window_end_s, end_s)
+                    for node_name, trace in monitor.traces.items()
+                ],
+            ))
+
+        nodes = []
+        for node_name, trace in monitor.traces.items():
+            results = [c for event in events for c in event.convergence if c.node == node_name]
+            nodes.append(NodeReport(
+                node=node_name,
+                convergence=LatencySummary.from_samples(
+                    [c.seconds for c in results if c.seconds is not None]
+                ),
+                unaffected=sum(1 for c in results if c.status == 'unaffected'),
+                timed_out=sum(1 for c in results if c.status == 'timeout'),
+                overlapped=sum(1 for c in results if c.status == 'overlapped'),
+                max_recv_q=max((s.recv_q for s in trace.backlog), default=0),
+                max_send_q=max((s.send_q for s in trace.backlog), default=0),
+                backlogged_samples=sum(1 for s in trace.backlog if s.recv_q or s.send_q),
+                total_samples=len(trace.backlog),
+            ))
+
+        return ChurnReport(
+            duration_s=end_s,
+            settled=settled,
+            dispatch_lag=LatencySummary.from_samples(
+                [none_throws(o.started_at_s) - o.scheduled_at_s for o in self._occurrences]
+            ),
+            nodes=nodes,
+            events=events,
+        )
+
+    async def run(self) -> ChurnReport:
+        schedule = self.schedule
+        self._executor = ThreadPoolExecutor(max_workers=schedule.max_workers)
+
+        monitor = ConvergenceMonitor(
+            self.driver,
+            self.config.topology.nodes,
+            self.services,
+            schedule.poll_interval_s,
+            # Polling gets its own pool so a saturated schedule can't starve the measurements
+            ThreadPoolExecutor(max_workers=2 * len(self.config.topology.nodes)),
+            self._wheel.now,
+        )
+
+        for event in schedule.events:
+            for index in range(event.repeat):
+                at_s = event.at_s + index * event.interval_s
+                self._wheel.schedule(at_s, partial(self._fire, event, index, at_s))
+
+        # Baseline fingerprint before anything fires, so changes from events at t=0 are not absorbed into it
+        await monitor.sample_all()
+
+        monitor_task = asyncio.create_task(monitor.run())
+        try:
+            logging.info(f'Running churn schedule with {self._wheel.pending} event occurrences')
+            await self._wheel.run()
+            while self._in_flight:
+                await asyncio.gather(*self._in_flight)
+
+            logging.info('Schedule complete, waiting for the network to settle')
+            settled = await monitor.wait_settled(schedule.settle_s, schedule.convergence_timeout_s)
+            if not settled:
+                logging.warning('Network did not settle before the convergence timeout')
+        finally:
+            monitor.stop()
+            await monitor_task
+            monitor.executor.shutdown()
+            self._executor.shutdown()
+
+        return self._build_report(monitor, settled)
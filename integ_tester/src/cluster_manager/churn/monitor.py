@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+from cluster_manager.configuration.models import Node, Service
+from cluster_manager.drivers.base import BaseDriver
+
+BGP_BACKLOG_COMMAND = "ss -Htn state established '( sport = :179 or dport = :179 )'"
+
+@dataclass
+class BacklogSample:
+    at_s: float
+    recv_q: int
+    send_q: int
+
+@dataclass
+class NodeTrace:
+    changes: List[float] = field(default_factory=list)
+    backlog: List[BacklogSample] = field(default_factory=list)
+    fingerprint: bytes | None = None
+    last_poll_s: float = 0.0
+
+class ConvergenceMonitor:
+    """
+    Polls every node for a fingerprint of its routing state and for the
+    amount of BGP data queued on its sockets.
+
+    Only the timestamps where the fingerprint changed are kept, reconvergence
+    is worked out from those after the run.
+    """
+    driver: BaseDriver
+    nodes: Dict[str, Node]
+    services: Dict[str, List[Service]]
+    traces: Dict[str, NodeTrace]
+
+    poll_interval_s: float
+    executor: Executor
+    clock: Callable[[], float]
+
+    _stopped: asyncio.Event
+
+    def __init__(
+        self,
+        driver: BaseDriver,
+        nodes: Dict[str, Node],
+        services: Dict[str, List[Service]],
+        poll_interval_s: float,
+        executor: Executor,
+        clock: Callable[[], float],
+    ):
+        self.driver = driver
+        self.nodes = nodes
+        self.services = services
+        self.traces = {node_name: NodeTrace() for node_name in nodes}
+        self.poll_interval_s = poll_interval_s
+        self.executor = executor
+        self.clock = clock
+        self._stopped = asyncio.Event()
+
+    async def _exec(self, node: Node, cmd: str | List[str]) -> bytes:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, self.driver.run_cmd, node, cmd)
+        return result.output or b''
+
+    async def _sample_state(self, node: Node) -> bytes:
+        digest = hashlib.sha256()
+        for service in self.services[node.name]:
+            digest.update(await self._exec(node, service.get_state_command()))
+        return digest.digest()
+
+    async def _sample_backlog(self, node: Node, at_s: float) -> BacklogSample:
+        output = await self._exec(node, BGP_BACKLOG_COMMAND)
+
+        recv_q = 0
+        send_q = 0
+        for line in output.decode(errors='replace').splitlines():
+            columns = line.split()
+            if len(columns) < 2 or not columns[0].isdigit():
+                continue
+            recv_q += int(columns[0])
+            send_q += int(columns[1])
+
+        return BacklogSample(at_s=at_s, recv_q=recv_q, send_q=send_q)
+
+    async def _sample_node(self, node: Node):
+        trace = self.traces[node.name]
+        sampled_at = self.clock()
+        try:
+            fingerprint, backlog = await asyncio.gather(
+                self._sample_state(node),
+                self._sample_backlog(node, sampled_at),
+            )
+        except Exception as e:
+            logging.warning(f'Failed to poll node {node.name}: {e}')
+            return
+
+        if trace.fingerprint is not None and fingerprint != trace.fingerprint:
+            trace.changes.append(sampled_at)
+        trace.fingerprint = fingerprint
+        trace.backlog.append(backlog)
+        trace.last_poll_s = sampled_at
+
+    async def sample_all(self):
+        await asyncio.gather(*(self._sample_node(node) for node in self.nodes.values()))
+
+    async def _poll_node(self, node: Node):
+        while not self._stopped.is_set():
+            await self._sample_node(node)
+
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval_s)
+            except TimeoutError:
+                pass
+
+    async def run(self):
+        await asyncio.gather(*(self._poll_node(node) for node in self.nodes.values()))
+
+    def stop(self):
+        self._stopped.set()
+
+    def is_settled(self, settle_s: float) -> bool:
+        now = self.clock()
+        for trace in self.traces.values():
+            last_change = trace.changes[-1] if trace.changes else 0.0
+            if now - last_change < settle_s or trace.last_poll_s <= last_change:
+                return False
+        return True
+
+    async def wait_settled(self, settle_s: float, timeout_s: float) -> bool:
+        deadline = self.clock() + timeout_s
+        while self.clock() < deadline:
+            if self.is_settled(settle_s):
+                return True
+            await asyncio.sleep(self.poll_interval_s)
+
+        return False
@@ -0,0 +1,69 @@
+import math
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class LatencySummary(BaseModel):
+    count: int
+    p50: float | None = None
+    p90: float | None = None
+    p99: float | None = None
+    max: float | None = None
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> LatencySummary:
+        if not samples:
+            return cls(count=0)
+
+        ordered = sorted(samples)
+
+        def percentile(q: float) -> float:
+            # Nearest-rank, good enough for the sample counts a run produces
+            return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+        return cls(
+            count=len(ordered),
+            p50=percentile(0.50),
+            p90=percentile(0.90),
+            p99=percentile(0.99),
+            max=ordered[-1],
+        )
+
+class NodeConvergence(BaseModel):
+    node: str
+    status: Literal['converged', 'unaffected', 'timeout', 'overlapped']
+    seconds: float | None = None
+
+class EventReport(BaseModel):
+    label: str
+    kind: str
+    node: str
+    index: int
+
+    scheduled_at_s: float
+    started_at_s: float
+    restored_at_s: float | None = None
+
+    failures: List[str]
+    convergence: List[NodeConvergence]
+
+class NodeReport(BaseModel):
+    node: str
+    convergence: LatencySummary
+    unaffected: int
+    timed_out: int
+    overlapped: int
+
+    max_recv_q: int
+    max_send_q: int
+    backlogged_samples: int
+    total_samples: int
+
+class ChurnReport(BaseModel):
+    duration_s: float
+    settled: bool
+
+    dispatch_lag: LatencySummary
+    nodes: List[NodeReport]
+    events: List[EventReport]
@@ -0,0 +1,112 @@
+import ipaddress as ip
+import uuid
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Annotated, Dict, List, Literal, Self, override
+
+from pydantic import BaseModel, Field, model_validator
+
+from cluster_manager.configuration.models import Service
+
+
+@dataclass
+class ChurnStep:
+    offset_s: float
+    cmd: str | List[str]
+    wait: bool = True
+    # Installed in the node right before the command runs, keyed by their path
+    files: Dict[str, bytes] = field(default_factory=dict)
+
+class ChurnEventBase(BaseModel):
+    kind: str
+    name: str | None = None
+    node: str
+
+    at_s: float = Field(default=0.0, ge=0)
+    repeat: int = Field(default=1, ge=1)
+    interval_s: float = Field(default=0.0, ge=0)
+
+    def label(self) -> str:
+        return self.name or f'{self.kind}@{self.node}'
+
+    @abstractmethod
+    def steps(self, services: List[Service]) -> List[ChurnStep]:
+        pass
+
+class LinkFlap(ChurnEventBase):
+    kind: Literal['link_flap'] = 'link_flap'
+    interface: str
+    down_for_s: float = Field(default=1.0, ge=0)
+
+    @override
+    def steps(self, services: List[Service]) -> List[ChurnStep]:
+        return [
+            ChurnStep(0.0, f'ip link set {self.interface} down'),
+            ChurnStep(self.down_for_s, f'ip link set {self.interface} up'),
+        ]
+
+class ServiceRestart(ChurnEventBase):
+    kind: Literal['service_restart'] = 'service_restart'
+    down_for_s: float = Field(default=0.0, ge=0)
+
+    @override
+    def steps(self, services: List[Service]) -> List[ChurnStep]:
+        return [
+            ChurnStep(0.0, service.get_stop_command()) for service in services
+        ] + [
+            ChurnStep(self.down_for_s, service.get_start_command(), wait=False) for service in services
+        ]
+
+class PrefixBurst(ChurnEventBase):
+    kind: Literal['prefix_burst'] = 'prefix_burst'
+    base_prefix: ip.IPv4Network
+    prefix_length: int = Field(default=24, ge=1, le=32)
+    count: int = Field(default=1, ge=1)
+    table: int = 100
+    withdraw_after_s: float | None = Field(default=None, ge=0)
+
+    @model_validator(mode='after')
+    def _check_fits(self) -> Self:
+        if self.prefix_length < self.base_prefix.prefixlen:
+            raise ValueError(f'prefix_length /{self.prefix_length} is shorter than {self.base_prefix}')
+
+        capacity = 2 ** (self.prefix_length - self.base_prefix.prefixlen)
+        if self.count > capacity:
+            raise ValueError(f'{self.base_prefix} only holds {capacity} /{self.prefix_length} prefixes')
+
+        return self
+
+    def prefixes(self) -> List[ip.IPv4Network]:
+        return list(islice(self.base_prefix.subnets(new_prefix=self.prefix_length), self.count))
+
+    def _batch(self, op: str) -> ChurnStep:
+        # The routes go through a batch file, a burst doesn't fit in a single exec argument
+        lines = ''.join(f'route {op} blackhole {prefix} table {self.table}\n' for prefix in self.prefixes())
+        path = f'/tmp/churn-{uuid.uuid4().hex}.batch'
+        return ChurnStep(
+            0.0,
+            ['sh', '-c', f'ip -force -batch {path}; rc=$?; rm -f {path}; exit $rc'],
+            files={path: lines.encode()},
+        )
+
+    @override
+    def steps(self, services: List[Service]) -> List[ChurnStep]:
+        steps = [self._batch('replace')]
+        if self.withdraw_after_s is not None:
+            withdraw = self._batch('del')
+            withdraw.offset_s = self.withdraw_after_s
+            steps.append(withdraw)
+        return steps
+
+ChurnEvent = Annotated[LinkFlap | ServiceRestart | PrefixBurst, Field(discriminator='kind')]
+
+class ChurnSchedule(BaseModel):
+    events: List[ChurnEvent]
+
+    tick_ms: float = Field(default=1.0, gt=0)
+    max_workers: int = Field(default=32, ge=1)
+
+    poll_interval_s: float = Field(default=0.2, gt=0)
+    settle_s: float = Field(default=3.0, gt=0)
+    convergence_timeout_s: float = Field(default=120.0, gt=0)
@@ -0,0 +1,69 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+
+
+@dataclass
+class _Timer:
+    tick: int
+    callback: Callable[[], None]
+
+class TimerWheel:
+    """
+    Hashed timer wheel driven by the asyncio loop.
+
+    Timers are bucketed by tick, so firing a tick only touches the timers that
+    hashed into its slot instead of keeping a heap of every pending event.
+    Callbacks run on the loop and must not block, they are expected to spawn
+    tasks for any real work.
+    """
+    tick_s: float
+    slots: List[List[_Timer]]
+
+    current_tick: int
+    pending: int
+
+    _started_at: float | None
+
+    def __init__(self, tick_s: float, slot_count: int = 4096):
+        self.tick_s = tick_s
+        self.slots = [[] for _ in range(slot_count)]
+        self.current_tick = 0
+        self.pending = 0
+        self._started_at = None
+
+    # Reads the monotonic clock directly (the loop's default clock) so worker threads can timestamp too
+    def now(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return time.monotonic() - self._started_at
+
+    def schedule(self, at_s: float, callback: Callable[[], None]):
+        tick = max(self.current_tick, math.ceil(at_s / self.tick_s))
+        self.slots[tick % len(self.slots)].append(_Timer(tick, callback))
+        self.pending += 1
+
+    def _fire_tick(self):
+        slot = self.slots[self.current_tick % len(self.slots)]
+
+        due = [timer for timer in slot if timer.tick <= self.current_tick]
+        if due:
+            slot[:] = [timer for timer in slot if timer.tick > self.current_tick]
+
+        for timer in due:
+            self.pending -= 1
+            timer.callback()
+
+    async def run(self):
+        self._started_at = time.monotonic()
+
+        while self.pending:
+            now_tick = int(self.now() / self.tick_s)
+            # Catch up on every tick that elapsed while we were asleep
+            while self.current_tick <= now_tick and self.pending:
+                self._fire_tick()
+                self.current_tick += 1
+
+            await asyncio.sleep(max(0.0, self.current_tick * self.tick_s - self.now()))
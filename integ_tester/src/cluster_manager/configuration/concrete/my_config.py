@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List, Mapping, override
 
 from cluster_manager.configuration.models import (
+    ImageSpec,
     Node,
     Service,
     TestingConfiguration,
@@ -16,6 +17,9 @@ from cluster_manager.configuration.models import (
 
 
 class BirdService(Service):
+    # See the `churn` kernel protocol in the bird configs
+    kernel_route_table = 100
+
     def __init__(self, node: Node):
         super().__init__(node)
 
@@ -38,12 +42,25 @@ class BirdService(Service):
     def get_start_command(self) -> str | List[str]:
         return ['bird']
 
+    @override
+    def get_stop_command(self) -> str | List[str]:
+        return ['birdc', 'down']
+
+    @override
+    def get_state_command(self) -> str | List[str]:
+        return ['birdc', 'show', 'route', 'all']
+
 START_UP_SCRIPT="""
 #!/bin/bash
 
 bgpz -c /etc/bgpz/bgpz.json 1>/tmp/bgp.log 2>&1 
 """
 
+# Walks /proc so stopping bgpz only needs sh
+BGPZ_STOP_COMMAND='for p in /proc/[0-9]*; do [ "$(cat $p/comm 2>/dev/null)" = bgpz ] && kill ${p#/proc/}; done; true'
+
+BGPZ_UPDATES_COMMAND="grep -e 'sending peer' -e 'Sending update' /tmp/bgp.log | grep -vc '(0 dropped, 0 advertised)'"
+
 class BgpzService(Service):
     def __init__(self, node: Node):
         super().__init__(node)
@@ -69,6 +86,15 @@ class BgpzService(Service):
         return 'bash -c /usr/bin/start-bgp'
         # return 'cat /usr/bin/start-bgp'
 
+    @override
+    def get_stop_command(self) -> str | List[str]:
+        return ['sh', '-c', BGPZ_STOP_COMMAND]
+
+    @override
+    def get_state_command(self) -> str | List[str]:
+        # bgpz has no way to dump its RIB yet, count the non-empty update batches it has sent instead
+        return ['sh', '-c', BGPZ_UPDATES_COMMAND]
+
 class MyTestingConfiguration(TestingConfiguration):
     _topology: Topology
 
@@ -128,6 +154,32 @@ class MyTestingConfiguration(TestingConfiguration):
             BgpzService
         ]
 
+    @override
+    def get_images(self) -> List[ImageSpec]:
+        project_root = Path(os.environ['PROJECT_ROOT'])
+        images_dir = project_root / 'integ_tester'
+
+        base = ImageSpec(
+            name='integ-base',
+            dockerfile=images_dir / 'base' / 'Dockerfile',
+            parent='debian:stable',
+        )
+        return [
+            ImageSpec(
+                name='bird-docker',
+                dockerfile=images_dir / 'bird' / 'Dockerfile',
+                parent=base,
+            ),
+            ImageSpec(
+                name='bgpz-docker',
+                dockerfile=images_dir / 'bgpz' / 'Dockerfile',
+                parent=base,
+                files={
+                    'bgpz': project_root / 'zig-out' / 'bin' / 'bgpz',
+                },
+            ),
+        ]
+
     @override
     @property
     def topology(self) -> Topology:
@@ -7,7 +7,8 @@ from typing import List
 import ipaddress as ip
 import typing as t
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Dict
 
 IpInterface = ip.IPv4Interface | ip.IPv6Interface
@@ -62,7 +63,19 @@ class Topology:
             ),
         ))
 
+@dataclass
+class ImageSpec:
+    name: str
+    dockerfile: Path
+    # Either a plain image reference or another spec that has to be built first
+    parent: str | ImageSpec
+    # Extra files sent in the build context, keyed by their name in the context
+    files: Dict[str, Path] = field(default_factory=dict)
+
 class Service(ABC):
+    # Kernel table the service learns routes from, if any
+    kernel_route_table: t.ClassVar[int | None] = None
+
     node: Node
 
     def __init__(self, node: Node):
@@ -80,6 +93,15 @@ class Service(ABC):
     def get_start_command(self) -> str | List[str]:
         pass
 
+    @abstractmethod
+    def get_stop_command(self) -> str | List[str]:
+        pass
+
+    # Output must change whenever the service's routing state does
+    @abstractmethod
+    def get_state_command(self) -> str | List[str]:
+        pass
+
 class TestingConfiguration(ABC):
     @property
     @abstractmethod
@@ -90,6 +112,10 @@ class TestingConfiguration(ABC):
     def get_services(self) -> List[Type[Service]]:
         pass
 
+    @abstractmethod
+    def get_images(self) -> List[ImageSpec]:
+        pass
+
     @classmethod
     @abstractmethod
     def deserialize(cls, data: Dict[str, JSON]) -> TestingConfiguration:
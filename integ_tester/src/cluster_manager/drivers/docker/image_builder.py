@@ -0,0 +1,148 @@
+import hashlib
+import io
+import logging
+import tarfile
+import typing as t
+from pathlib import Path
+
+from docker import DockerClient
+from docker.errors import APIError, ImageNotFound
+from pyre_extensions import none_throws
+
+from cluster_manager.configuration.models import ImageSpec
+
+TAG_LENGTH = 16
+CONTENT_HASH_LABEL = 'cluster_manager.content_hash'
+
+class LocalImageBuilder:
+    """
+    Builds the images a configuration needs, tagged by a hash of everything
+    that goes into them: the Dockerfile, the parent image and the files sent
+    in the build context.
+
+    An image whose tag already exists is never rebuilt, and since parents are
+    separate images a change to the bgpz binary only rebuilds the layer that
+    copies it.
+    """
+    client: DockerClient
+
+    built_tags: t.Dict[str, str]
+
+    def __init__(self, client: DockerClient):
+        self.client = client
+        self.built_tags = {}
+
+    @staticmethod
+    def _file_digest(path: Path) -> bytes:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').digest()
+
+    def _resolve_parent(self, parent: str | ImageSpec) -> t.Tuple[str, str]:
+        """
+        Returns the reference to build FROM and the identity that goes into the hash.
+        """
+        if isinstance(parent, ImageSpec):
+            tag = self.ensure(parent)
+            return tag, tag
+
+        try:
+            image = self.client.images.get(parent)
+        except ImageNotFound:
+            logging.info(f'Pulling image {parent}')
+            image = self.client.images.pull(parent)
+
+        # Hash the external parent by id so a refreshed upstream tag rebuilds everything on top of it
+        return parent, none_throws(image.id)
+
+    def _content_hash(self, spec: ImageSpec, parent_id: str) -> str:
+        missing = [path.as_posix() for path in spec.files.values() if not path.exists()]
+        if missing:
+            raise FileNotFoundError(f'Missing build inputs for image {spec.name}: {", ".join(missing)}')
+
+        digest = hashlib.sha256()
+        digest.update(parent_id.encode())
+        digest.update(self._file_digest(spec.dockerfile))
+
+        for name, path in sorted(spec.files.items()):
+            digest.update(f'\0{name}\0'.encode())
+            digest.update(self._file_digest(path))
+
+        return digest.hexdigest()[:TAG_LENGTH]
+
+    def _build_context(self, spec: ImageSpec) -> io.BytesIO:
+        stream = io.BytesIO()
+        with tarfile.open(fileobj=stream, mode='w') as tar:
+            tar.add(spec.dockerfile, arcname='Dockerfile')
+            for name, path in spec.files.items():
+                tar.add(path, arcname=name)
+
+        stream.seek(0)
+        return stream
+
+    def _tag_exists(self, tag: str) -> bool:
+        try:
+            self.client.images.get(tag)
+        except ImageNotFound:
+            return False
+
+        return True
+
+    def ensure(self, spec: ImageSpec) -> str:
+        if spec.name in self.built_tags:
+            return self.built_tags[spec.name]
+
+        parent_ref, parent_id = self._resolve_parent(spec.parent)
+        content_hash = self._content_hash(spec, parent_id)
+        tag = f'{spec.name}:{content_hash}'
+
+        if self._tag_exists(tag):
+            logging.info(f'Image {tag} is up to date')
+        else:
+            logging.info(f'Building image {tag}')
+            self.client.images.build(
+                fileobj=self._build_context(spec),
+                custom_context=True,
+                tag=tag,
+                buildargs={'BASE_IMAGE': parent_ref},
+                labels={CONTENT_HASH_LABEL: content_hash},
+                rm=True,
+            )
+
+        self.built_tags[spec.name] = tag
+        return tag
+
+    def prune_stale(self):
+        """
+        Removes the tags left behind by earlier builds of the images this
+        builder produced, keeping any image a container still uses.
+
+        Only tags this builder created are touched: the image must carry the
+        content hash label and the tag must be that hash.
+        """
+        in_use = {
+            container.attrs.get('Image') for container in self.client.containers.list(all=True)
+        }
+
+        # Children first, a stale parent can't go while stale images are still built on it
+        for name, current_tag in reversed(list(self.built_tags.items())):
+            for image in self.client.images.list(name=name, filters={'label': CONTENT_HASH_LABEL}):
+                if image.id in in_use:
+                    continue
+
+                content_hash = image.labels.get(CONTENT_HASH_LABEL)
+                for stale_tag in image.tags:
+                    if stale_tag == current_tag or stale_tag != f'{name}:{content_hash}':
+                        continue
+
+                    logging.info(f'Removing stale image {stale_tag}')
+                    try:
+                        self.client.images.remove(stale_tag)
+                    except APIError as e:
+                        logging.warning(f'Failed to remove stale image {stale_tag}: {e}')
+
+    def build_all(self, specs: t.List[ImageSpec], prune: bool = False) -> t.Dict[str, str]:
+        tags = {spec.name: self.ensure(spec) for spec in specs}
+        if prune:
+            self.prune_stale()
+
+        return tags
@@ -10,6 +10,7 @@ import cluster_manager.drivers.docker.local_network_spec as spec
 from cluster_manager.configuration.models import TestingConfiguration
 from cluster_manager.drivers.base import BaseDriver, BaseHelper
 from cluster_manager.drivers.docker.driver import LocalDockerDriver
+from cluster_manager.drivers.docker.image_builder import LocalImageBuilder
 from cluster_manager.drivers.docker.network_builder import (
     LocalNetwork,
     LocalNetworkBuilder,
@@ -25,12 +26,13 @@ class LocalDockerHelper(BaseHelper):
         self.client = DockerClient(base_url='unix:///var/run/docker.sock')
         self.api_client = APIClient(base_url='unix:///var/run/docker.sock')
 
-    def _run_builder(self, config: TestingConfiguration) -> LocalNetwork:
-        builder = LocalNetworkBuilder(self.client, self.api_client, config.topology)
+    def _run_builder(self, config: TestingConfiguration, prune_images: bool) -> LocalNetwork:
+        image_tags = LocalImageBuilder(self.client).build_all(config.get_images(), prune=prune_images)
+        builder = LocalNetworkBuilder(self.client, self.api_client, config.topology, image_tags)
         return builder.start_network()
     
-    def build_network(self, config: TestingConfiguration) -> DriverData:
-        local_network = self._run_builder(config)
+    def build_network(self, config: TestingConfiguration, prune_images: bool = False) -> DriverData:
+        local_network = self._run_builder(config, prune_images)
 
         try:
             return DriverData(
@@ -30,12 +30,15 @@ class LocalNetworkBuilder:
     node_to_container_map: t.Dict[str, Container]
 
     topology: Topology
+    # Image name to the content-addressed tag it was built as
+    image_tags: t.Dict[str, str]
 
-    def __init__(self, docker_client: DockerClient, docker_api_client: APIClient, topology: Topology):
+    def __init__(self, docker_client: DockerClient, docker_api_client: APIClient, topology: Topology, image_tags: t.Dict[str, str]):
         self.client = docker_client
         self.api_client = docker_api_client
         self.node_to_container_map = {}
         self.topology = topology
+        self.image_tags = image_tags
 
     @staticmethod
     def teardown_network(network: LocalNetwork):
@@ -92,7 +95,10 @@ class LocalNetworkBuilder:
     def _start_node(self, node: Node, network: Network) -> Container:
         logging.info(f"Starting node: {node.name}")
 
-        image = self.client.images.get(node.image_name)
+        if node.image_name not in self.image_tags:
+            raise ValueError(f'No image spec builds {node.image_name} for node {node.name}')
+
+        image = self.client.images.get(self.image_tags[node.image_name])
 
         return self._run_container(image, node.name, network)
 